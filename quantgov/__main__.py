@@ -54,6 +54,14 @@ def parse_args():
             type=lambda x: open(x, 'w', newline='', encoding=ENCODE_OUT),
             default=sys.stdout
         )
+        subcommand.add_argument(
+            '--worker', choices=['process', 'thread'], default='process',
+            help=('run documents in parallel processes (default) or threads')
+        )
+        subcommand.add_argument(
+            '--max_workers', type=int,
+            help='maximum number of documents to process in parallel'
+        )
 
     # ML Command
     ml_parser = subparsers.add_parser('ml')
@@ -176,13 +184,21 @@ def run_corpus_builtin(args):
     writer = csv.writer(args.outfile)
     builtin = quantgov.nlp.commands[args.subcommand]
     func_args = {i: j for i, j in vars(args).items()
-                 if i not in {'command', 'subcommand', 'outfile', 'corpus'}}
+                 if i not in {'command', 'subcommand', 'outfile', 'corpus',
+                              'worker', 'max_workers'}}
     writer.writerow(driver.index_labels + builtin.get_columns(func_args))
     partial = functools.partial(
         builtin.process_document,
         **func_args
     )
-    for result in quantgov.utils.lazy_parallel(partial, driver.stream()):
+    # Pools only take an initializer from Python 3.7 on; earlier versions
+    # just load whatever warm() would have on the first document instead
+    initializer = (getattr(builtin, 'warm', None)
+                   if sys.version_info >= (3, 7) else None)
+    for result in quantgov.utils.lazy_parallel(
+            partial, driver.stream(),
+            worker=args.worker, max_workers=args.max_workers,
+            initializer=initializer):
         if result:
             writer.writerow(result)
             args.outfile.flush()
@@ -1,16 +1,20 @@
 """
 quantgov.nlp: Text-based analysis of documents
 """
+import argparse
 import collections
-import math
+import functools
+import itertools
 import re
+import threading
 
-from decorator import decorator
+import numpy as np
 
 from . import utils
 
 try:
     import nltk.corpus
+    import nltk.stem
     NLTK = True
 except ImportError:
     NLTK = None
@@ -25,35 +29,230 @@ try:
 except ImportError:
     textstat = None
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 if NLTK:
-    try:
-        nltk.corpus.wordnet.ensure_loaded()
-    except LookupError:
-        nltk.download('wordnet')
-        nltk.corpus.wordnet.ensure_loaded()
+    lemmatizer = nltk.stem.WordNetLemmatizer()
+
+_WORDNET_READY = False
+_WORDNET_LOCK = threading.Lock()
 
 commands = {}
 
+_REGEX_METACHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+_DEFAULT_WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Whether each ASCII code point is a regex word character (\w)
+_ASCII_WORD_CHARS = np.array(
+    [chr(i).isalnum() or chr(i) == '_' for i in range(128)], dtype=bool)
+
+# Python's \s also matches these ASCII separators, while Hyperscan's does not
+_HYPERSCAN_WHITESPACE = bytes.maketrans(b'\x1c\x1d\x1e\x1f', b'    ')
+
+
+def requires(**dependencies):
+    """
+    Class decorator for commands that need optional packages
+
+    Keyword arguments map package names to their imported modules, which are
+    None if the import failed. If any is missing, process_document is
+    replaced at import time with a stub that raises a RuntimeError; otherwise
+    the class is left untouched, so documents are processed without a
+    per-call check.
+    """
+    def decorate(cls):
+        missing = [name for name, module in dependencies.items()
+                   if module is None]
+        if missing:
+            func = cls.process_document
+
+            # Keep func's name so the stub still pickles for process pools
+            @functools.wraps(func)
+            def process_document(*args, **kwargs):
+                raise RuntimeError(
+                    'Must install {} to use {}'.format(missing[0], func))
+            cls.process_document = staticmethod(process_document)
+        return cls
+    return decorate
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _at_word_boundary(text, index):
+    """
+    Return True if a regex word boundary assertion would match at index
+    """
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+def _leftmost_longest(hits):
+    """
+    Reduce (start, end, value) hits to the non-overlapping values a regular
+    expression alternation ordered longest-first would find
+    """
+    last_end = 0
+    for start, end, value in sorted(hits, key=lambda x: (x[0], -x[1])):
+        if start >= last_end:
+            last_end = end
+            yield value
+
+
+def _literal_automaton(terms):
+    """
+    Return an Aho-Corasick automaton whose values are (length, term)
+    """
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, (len(term), term))
+    automaton.make_automaton()
+    return automaton
+
+
+def _bounded_hits(text, automaton):
+    """
+    Yield (start, end, term) for automaton matches in text that begin and end
+    at word boundaries
+    """
+    for last, (length, term) in automaton.iter(text):
+        start = last - length + 1
+        if (_at_word_boundary(text, start)
+                and _at_word_boundary(text, last + 1)):
+            yield start, last + 1, term
+
+
+def _trie_pattern(terms):
+    """
+    Return a regex alternation of literal terms with common prefixes shared,
+    so "cat", "car" and "cart" become "ca(?:r(?:t)?|t)"
+
+    Terms that can match at the same position are prefixes of one another,
+    and the trie tries longer continuations before stopping, so the result
+    matches exactly as the terms sorted longest-first would.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[None] = None
+
+    def build(node):
+        chars = []
+        while len(node) == 1 and None not in node:
+            char, node = next(iter(node.items()))
+            chars.append(re.escape(char))
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items(),
+                                              key=lambda x: x[0] or '')
+                    if char is not None]
+        if not branches:
+            suffix = ''
+        elif None in node:
+            suffix = '(?:{})?'.format('|'.join(branches))
+        else:
+            suffix = '(?:{})'.format('|'.join(branches))
+        return ''.join(chars) + suffix
 
-@decorator
-def check_nltk(func, *args, **kwargs):
-    if NLTK is None:
-        raise RuntimeError('Must install NLTK to use {}'.format(func))
-    return func(*args, **kwargs)
+    return build(trie)
 
 
-@decorator
-def check_textblob(func, *args, **kwargs):
-    if textblob is None:
-        raise RuntimeError('Must install textblob to use {}'.format(func))
-    return func(*args, **kwargs)
+def _count_matches(pattern, text):
+    """
+    Count the non-overlapping matches of pattern in text
+    """
+    # Match objects are discarded one at a time, so memory stays constant
+    # however many matches or however little text they cover
+    return sum(1 for _ in pattern.finditer(text))
 
 
-@decorator
-def check_textstat(func, *args, **kwargs):
+def _count_words(text):
+    """
+    Count the matches of \\b\\w+\\b in text, which are its maximal runs of
+    word characters, by classifying every character at once with NumPy
+    """
+    try:
+        codes = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        is_word = _ASCII_WORD_CHARS[codes]
+    except UnicodeEncodeError:
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        is_word = _ASCII_WORD_CHARS[np.minimum(codes, 127)]
+        high = np.flatnonzero(codes > 127)
+        high_codes = codes[high]
+        distinct = np.unique(high_codes)
+        distinct_is_word = np.array(
+            [chr(code).isalnum() for code in distinct.tolist()], dtype=bool)
+        is_word[high] = distinct_is_word[
+            np.searchsorted(distinct, high_codes)]
+    if not len(is_word):
+        return 0
+    return int(is_word[0]) + int(np.count_nonzero(is_word[1:] & ~is_word[:-1]))
+
+
+def _ensure_wordnet():
+    """
+    Load WordNet, downloading it if needed, the first time it is required
+    """
+    global _WORDNET_READY
+    with _WORDNET_LOCK:
+        if not _WORDNET_READY:
+            try:
+                nltk.corpus.wordnet.ensure_loaded()
+            except LookupError:
+                nltk.download('wordnet')
+                nltk.corpus.wordnet.ensure_loaded()
+            _WORDNET_READY = True
+
+
+def _parse_stopwords(value):
+    """
+    Parse a comma-separated --stopwords value into a frozenset, with "None"
+    meaning no stopwords
+    """
+    if value == 'None':
+        return frozenset()
+    words = (word.strip() for word in value.split(','))
+    return frozenset(word for word in words if word)
+
+
+@functools.lru_cache(maxsize=None)
+def _english_stopwords():
+    return frozenset(nltk.corpus.stopwords.words('english'))
+
+
+def _warm_textstat():
+    """
+    Load the pronouncing dictionary and hyphenator textstat counts syllables
+    with, so a worker pays for them once before its first document
+    """
     if textstat is None:
-        raise RuntimeError('Must install teststat to use {}'.format(func))
-    return func(*args, **kwargs)
+        return
+    try:
+        textstat.syllable_count('warm')
+    except LookupError:
+        # Missing corpus data is reported when documents are processed
+        pass
+
+
+# Bounded so that a long-running process does not keep every word it has
+# ever seen; identical words in later documents return the same lemma object
+@functools.lru_cache(maxsize=500000)
+def _lemmatize(word):
+    if not _WORDNET_READY:
+        _ensure_wordnet()
+    return lemmatizer.lemmatize(word)
 
 
 class WordCounter():
@@ -66,7 +265,7 @@ class WordCounter():
                 kwargs={
                     'help': 'regular expression defining a "word"',
                     'type': re.compile,
-                    'default': re.compile(r'\b\w+\b')
+                    'default': _DEFAULT_WORD_PATTERN
                 }
             )
         ]
@@ -78,14 +277,26 @@ class WordCounter():
 
     @staticmethod
     def process_document(doc, word_pattern):
-        return doc.index + (len(word_pattern.findall(doc.text)),)
+        if word_pattern == _DEFAULT_WORD_PATTERN:
+            try:
+                return doc.index + (_count_words(doc.text),)
+            except UnicodeEncodeError:
+                # Lone surrogates cannot be encoded; let re handle them
+                pass
+        return doc.index + (_count_matches(word_pattern, doc.text),)
 
 
 commands['count_words'] = WordCounter
 
 
 class OccurrenceCounter():
-
+    default_pattern = r'\b(?:{})\b'
+    automata = {}
+    patterns = {}
+    # Each automaton hit is checked in Python, so above about one hit per 50
+    # characters (e.g. for one-letter terms) the trie regex is faster
+    max_hit_density = 0.02
+    sample_size = 32768
     cli = utils.CLISpec(
         help="Term Counter for Specific Words",
         arguments=[
@@ -110,7 +321,7 @@ class OccurrenceCounter():
                 flags=('--pattern'),
                 kwargs={
                     'help': 'pattern to use in identifying words',
-                    'default': r'\b(?P<match>{})\b'
+                    'default': default_pattern
                 }
             )
         ]
@@ -122,14 +333,96 @@ class OccurrenceCounter():
             return tuple(args['terms']) + (args['total_label'],)
         return tuple(args['terms'])
 
+    @staticmethod
+    def get_automaton(terms):
+        """
+        Return an Aho-Corasick automaton matching terms literally, or None if
+        pyahocorasick is unavailable or any term uses regex syntax
+        """
+        key = frozenset(terms)
+        if key not in OccurrenceCounter.automata:
+            if ahocorasick is None or any(
+                    _REGEX_METACHARACTERS.intersection(term) for term in key):
+                automaton = None
+            else:
+                automaton = _literal_automaton(key)
+            OccurrenceCounter.automata[key] = automaton
+        return OccurrenceCounter.automata[key]
+
+    @staticmethod
+    def get_pattern(pattern, terms):
+        """
+        Return pattern compiled with terms as a longest-first alternation,
+        written as a trie if no term uses regex syntax
+        """
+        key = (pattern, tuple(terms))
+        if key not in OccurrenceCounter.patterns:
+            if any(_REGEX_METACHARACTERS.intersection(term) for term in terms):
+                alternation = '|'.join(
+                    sorted(terms, key=len, reverse=True))
+            else:
+                alternation = _trie_pattern(terms)
+            OccurrenceCounter.patterns[key] = re.compile(
+                pattern.format(alternation))
+        return OccurrenceCounter.patterns[key]
+
+    @staticmethod
+    def hits_are_sparse(text, automaton):
+        """
+        Return True if automaton hits in the start of text are sparse enough
+        for the automaton to beat the trie regex
+        """
+        sample = text[:OccurrenceCounter.sample_size]
+        limit = int(OccurrenceCounter.max_hit_density * len(sample))
+        hits = itertools.islice(automaton.iter(sample), limit + 1)
+        return sum(1 for _ in hits) <= limit
+
+    @staticmethod
+    def count_literals(text, automaton):
+        return collections.Counter(
+            _leftmost_longest(_bounded_hits(text, automaton)))
+
+    @staticmethod
+    def normalize(text, terms, pattern):
+        """
+        Lowercase text, collapsing whitespace only if a match could span it
+        """
+        text = text.lower()
+        if pattern != OccurrenceCounter.default_pattern or any(
+                term.split() != [term]
+                or _REGEX_METACHARACTERS.intersection(term)
+                for term in terms):
+            text = ' '.join(text.split())
+        return text
+
     @staticmethod
     def process_document(doc, terms, pattern, total_label):
-        text = ' '.join(doc.text.split()).lower()
-        terms_sorted = sorted(terms, key=len, reverse=True)
-        combined_pattern = re.compile(pattern.format('|'.join(terms_sorted)))
-        term_counts = collections.Counter(
-            i.groupdict()['match'] for i in combined_pattern.finditer(text)
-        )
+        text = OccurrenceCounter.normalize(doc.text, terms, pattern)
+        automaton = (OccurrenceCounter.get_automaton(terms)
+                     if pattern == OccurrenceCounter.default_pattern
+                     else None)
+        if (automaton is not None
+                and OccurrenceCounter.hits_are_sparse(text, automaton)):
+            term_counts = OccurrenceCounter.count_literals(text, automaton)
+        else:
+            combined_pattern = OccurrenceCounter.get_pattern(pattern, terms)
+            # Custom patterns capture the term in a group named "match"; the
+            # default pattern captures nothing, so any groups come from terms
+            if (pattern != OccurrenceCounter.default_pattern
+                    and 'match' in combined_pattern.groupindex):
+                group = 'match'
+                use_findall = combined_pattern.groups == 1
+            else:
+                group = 0
+                use_findall = combined_pattern.groups == 0
+            if use_findall:
+                # findall returns the lone group, or the whole match, directly
+                term_counts = collections.Counter(
+                    combined_pattern.findall(text))
+            else:
+                term_counts = collections.Counter(
+                    i.group(group) for i in combined_pattern.finditer(text)
+                )
         if total_label is not None:
             return (
                 doc.index
@@ -142,8 +435,128 @@ class OccurrenceCounter():
 commands['count_occurrences'] = OccurrenceCounter
 
 
+class _AppendColumn(argparse.Action):
+    """
+    Append (word boundary required, LABEL, TERM...) to a list shared by every
+    column flag, so that columns keep their command-line order
+    """
+    def __call__(self, parser, namespace, values, option_string=None):
+        columns = list(getattr(namespace, self.dest) or [])
+        columns.append((self.const,) + tuple(values))
+        setattr(namespace, self.dest, columns)
+
+
+@requires(pyahocorasick=ahocorasick)
+class MultiCount():
+    # Unlike count_occurrences, which matches terms as given against
+    # lowercased text, terms here are lowercased too, so matching ignores case
+    automata = {}
+    cli = utils.CLISpec(
+        help=('Count several columns of literal terms, ignoring case, in one '
+              'pass over each document'),
+        arguments=[
+            utils.CLIArg(
+                flags=('--column'),
+                kwargs={
+                    'dest': 'columns',
+                    'action': _AppendColumn,
+                    'const': True,
+                    'nargs': '+',
+                    'metavar': ('LABEL', 'TERM'),
+                    'default': [],
+                    'help': (
+                        'output a column with name LABEL counting whole-word'
+                        ' occurrences of any TERM'
+                    ),
+                }
+            ),
+            utils.CLIArg(
+                flags=('--substring_column'),
+                kwargs={
+                    'dest': 'columns',
+                    'action': _AppendColumn,
+                    'const': False,
+                    'nargs': '+',
+                    'metavar': ('LABEL', 'TERM'),
+                    'default': [],
+                    'help': (
+                        'output a column with name LABEL counting occurrences'
+                        ' of any TERM, including inside other words'
+                    ),
+                }
+            ),
+        ]
+    )
+
+    @staticmethod
+    def get_columns(args):
+        if not args['columns']:
+            raise ValueError(
+                'count_multiple needs at least one --column or '
+                '--substring_column')
+        for column in args['columns']:
+            if len(column) < 3:
+                raise ValueError(
+                    'Column {} has no terms to count'.format(column[1]))
+        return tuple(column[1] for column in args['columns'])
+
+    @staticmethod
+    def get_automaton(columns):
+        """
+        Return an Aho-Corasick automaton over the terms of every column, whose
+        values list (column index, word boundary required, length) for each
+        column a term belongs to, and whether any term spans whitespace;
+        the automaton is None if no column has terms
+        """
+        key = tuple(map(tuple, columns))
+        if key not in MultiCount.automata:
+            payloads = collections.defaultdict(list)
+            for index, (bounded, label, *terms) in enumerate(columns):
+                for term in set(MultiCount.normalize_term(i) for i in terms):
+                    payloads[term].append((index, bounded, len(term)))
+            automaton = None
+            if payloads:
+                automaton = ahocorasick.Automaton()
+                for term, payload in payloads.items():
+                    automaton.add_word(term, payload)
+                automaton.make_automaton()
+            MultiCount.automata[key] = (
+                automaton, any(' ' in term for term in payloads))
+        return MultiCount.automata[key]
+
+    @staticmethod
+    def normalize_term(term):
+        return ' '.join(term.lower().split())
+
+    @staticmethod
+    def process_document(doc, columns):
+        automaton, spans_whitespace = MultiCount.get_automaton(columns)
+        if automaton is None:
+            return doc.index + tuple(0 for _ in columns)
+        hits = [[] for _ in columns]
+        text = doc.text.lower()
+        if spans_whitespace:
+            text = ' '.join(text.split())
+        for last, payload in automaton.iter(text):
+            end = last + 1
+            for index, bounded, length in payload:
+                start = end - length
+                if not bounded or (_at_word_boundary(text, start)
+                                   and _at_word_boundary(text, end)):
+                    hits[index].append((start, end, None))
+        # Within a column, terms are counted as a longest-first alternation
+        # would count them, so overlapping hits are not double counted
+        return doc.index + tuple(
+            sum(1 for _ in _leftmost_longest(column_hits))
+            for column_hits in hits
+        )
+
+
+commands['count_multiple'] = MultiCount
+
+
+@requires(NLTK=NLTK)
 class ShannonEntropy():
-    lemmas = {}
     cli = utils.CLISpec(
         help='Shannon Entropy',
         arguments=[
@@ -158,17 +571,18 @@ class ShannonEntropy():
             utils.CLIArg(
                 flags=('--stopwords', '-sw'),
                 kwargs={
-                    'help': 'stopwords to ignore',
-                    'default': (
-                        None if not NLTK else
-                        nltk.corpus.stopwords.words('english')
-                    )
+                    'help': ('comma-separated stopwords to ignore, or None '
+                             'for no stopwords (default: the NLTK English '
+                             'stopwords)'),
+                    'type': _parse_stopwords,
+                    'default': None
                 }
             ),
             utils.CLIArg(
                 flags=('--precision'),
                 kwargs={
                     'help': 'decimal places to round',
+                    'type': int,
                     'default': 2
                 }
             )
@@ -177,33 +591,31 @@ class ShannonEntropy():
 
     @staticmethod
     def get_columns(args):
+        # Called once in the parent before any workers start, so WordNet is
+        # downloaded at most once rather than by every worker at the same time
+        if NLTK and not _WORDNET_READY:
+            _ensure_wordnet()
         return ('shannon_entropy',)
 
     @staticmethod
-    @check_nltk
-    @check_textblob
     def process_document(doc, word_pattern, precision, stopwords,
                          textblob=textblob, nltk=NLTK):
-        words = word_pattern.findall(doc.text)
-        lemmas = [
-            lemma for lemma in (
-                ShannonEntropy.lemmatize(word) for word in words
-            )
-            if lemma not in stopwords
-        ]
-        counts = collections.Counter(lemmas)
-        return doc.index + (round(sum(
-            -(count / len(lemmas) * math.log(count / len(lemmas), 2))
-            for count in counts.values()
-        ), int(precision)),)
-
-    def lemmatize(word):
-        if word in ShannonEntropy.lemmas:
-            lemma = ShannonEntropy.lemmas[word]
-        else:
-            lemma = textblob.Word(word).lemmatize()
-            ShannonEntropy.lemmas[word] = lemma
-        return lemma
+        if stopwords is None:
+            stopwords = _english_stopwords()
+        # Count raw tokens in C first so that lemmatization and stopword
+        # filtering run once per distinct word rather than once per token
+        word_counts = collections.Counter(word_pattern.findall(doc.text))
+        lemma_counts = collections.Counter()
+        for word, count in word_counts.items():
+            lemma = _lemmatize(word)
+            if lemma not in stopwords:
+                lemma_counts[lemma] += count
+        counts = np.fromiter(lemma_counts.values(), dtype=np.int64)
+        if not len(counts):
+            return doc.index + (0,)
+        probabilities = counts / counts.sum()
+        entropy = (probabilities * -np.log2(probabilities)).sum()
+        return doc.index + (round(float(entropy), precision),)
 
 
 commands['shannon_entropy'] = ShannonEntropy
@@ -222,6 +634,12 @@ class ConditionalCounter():
         r'|whenever|unless|notwithstanding'
         r'|in\s+the\s+event|in\s+no\s+event)\b'
     )
+    words = ('if', 'but', 'except', 'provided', 'when', 'where', 'whenever',
+             'unless', 'notwithstanding')
+    automaton = None if ahocorasick is None else _literal_automaton(words)
+    # Leading with a literal lets re skip straight to candidates; the word
+    # boundary before "in" is checked on each match instead
+    phrase_pattern = re.compile(r'in\s+(?:the|no)\s+event\b')
 
     @staticmethod
     def get_columns(args):
@@ -229,13 +647,24 @@ class ConditionalCounter():
 
     @staticmethod
     def process_document(doc):
-        return doc.index + (len(ConditionalCounter.pattern.findall(
-                                ' '.join((doc.text).splitlines()))),)
+        if ConditionalCounter.automaton is None:
+            return doc.index + (
+                _count_matches(ConditionalCounter.pattern, doc.text),)
+        # No term can occur inside a match of another, so every bounded hit
+        # is one match of the combined pattern
+        count = sum(
+            1 for _ in _bounded_hits(doc.text, ConditionalCounter.automaton))
+        count += sum(
+            1 for match in ConditionalCounter.phrase_pattern.finditer(doc.text)
+            if _at_word_boundary(doc.text, match.start())
+        )
+        return doc.index + (count,)
 
 
 commands['count_conditionals'] = ConditionalCounter
 
 
+@requires(NLTK=NLTK, textblob=textblob)
 class SentenceLength():
 
     cli = utils.CLISpec(
@@ -245,6 +674,7 @@ class SentenceLength():
                 flags=('--precision'),
                 kwargs={
                     'help': 'decimal places to round',
+                    'type': int,
                     'default': 2
                 }
             ),
@@ -265,20 +695,15 @@ class SentenceLength():
         return ('sentence_length',)
 
     @staticmethod
-    @check_nltk
-    @check_textblob
     def process_document(doc, precision, threshold):
         sentences = textblob.TextBlob(doc.text).sentences
         if not len(sentences):
             return doc.index + (None,)
+        sentence_length = sum(
+            len(sentence.words) for sentence in sentences) / len(sentences)
         # Allows for rounding to a specified number of decimals
-        elif precision:
-            sentence_length = round(sum(len(
-                sentence.words) for sentence in sentences) / len(sentences),
-                int(precision))
-        else:
-            sentence_length = sum(len(
-                sentence.words) for sentence in sentences) / len(sentences)
+        if precision is not None:
+            sentence_length = round(sentence_length, precision)
         # Filters values based on threshold
         if not threshold or sentence_length < threshold:
             return doc.index + (sentence_length,)
@@ -289,6 +714,7 @@ class SentenceLength():
 commands['sentence_length'] = SentenceLength
 
 
+@requires(NLTK=NLTK, textblob=textblob)
 class SentimentAnalysis():
 
     cli = utils.CLISpec(
@@ -305,6 +731,7 @@ class SentimentAnalysis():
                 flags=('--precision'),
                 kwargs={
                     'help': 'decimal places to round',
+                    'type': int,
                     'default': 2
                 }
             )
@@ -319,16 +746,16 @@ class SentimentAnalysis():
             raise NotImplementedError
 
     @staticmethod
-    @check_nltk
-    @check_textblob
     def process_document(doc, backend, precision):
         if backend == 'textblob':
-            sentiment = textblob.TextBlob(doc.text)
+            # One analysis yields both scores; the separate polarity and
+            # subjectivity properties would each analyze the text again
+            sentiment = textblob.TextBlob(doc.text).sentiment
             # Allows for rounding to a specified number of decimals
-            if precision:
+            if precision is not None:
                 return (doc.index + (round(
-                        sentiment.polarity, int(precision)),
-                    round(sentiment.subjectivity, int(precision)),))
+                        sentiment.polarity, precision),
+                    round(sentiment.subjectivity, precision),))
             else:
                 return (doc.index + (sentiment.polarity,
                                      sentiment.subjectivity,))
@@ -337,6 +764,7 @@ class SentimentAnalysis():
 commands['sentiment_analysis'] = SentimentAnalysis
 
 
+@requires(textstat=textstat)
 class FleschReadingEase():
 
     cli = utils.CLISpec(
@@ -359,7 +787,10 @@ class FleschReadingEase():
         return ('flesch_reading_ease',)
 
     @staticmethod
-    @check_textstat
+    def warm():
+        _warm_textstat()
+
+    @staticmethod
     def process_document(doc, threshold):
         score = textstat.flesch_reading_ease(doc.text)
         # Filters values based on threshold
@@ -372,6 +803,7 @@ class FleschReadingEase():
 commands['flesch_reading_ease'] = FleschReadingEase
 
 
+@requires(textstat=textstat)
 class TextStandard():
 
     cli = utils.CLISpec(
@@ -384,7 +816,10 @@ class TextStandard():
         return ('text_standard',)
 
     @staticmethod
-    @check_textstat
+    def warm():
+        _warm_textstat()
+
+    @staticmethod
     def process_document(doc):
         score = textstat.text_standard(doc.text)
         # Allows for rounding to a specified number of decimals
@@ -394,6 +829,49 @@ class TextStandard():
 commands['text_standard'] = TextStandard
 
 
+@requires(textstat=textstat)
+class Readability():
+
+    cli = utils.CLISpec(
+        help=('Flesch Reading Ease and Text Standard metrics from a single '
+              'textstat pass'),
+        arguments=[
+            utils.CLIArg(
+                flags=('--threshold'),
+                kwargs={
+                    'help': ('minimum Flesch Reading Ease score to allow '
+                             '(set to 0 for no filtering)'),
+                    'type': int,
+                    'default': -100
+                }
+            )
+        ]
+    )
+
+    @staticmethod
+    def get_columns(args):
+        return ('flesch_reading_ease', 'text_standard')
+
+    @staticmethod
+    def warm():
+        _warm_textstat()
+
+    @staticmethod
+    def process_document(doc, threshold):
+        # textstat memoizes its sentence, word and syllable counts per text,
+        # so the second metric reuses the counts computed for the first
+        standard = textstat.text_standard(doc.text)
+        score = textstat.flesch_reading_ease(doc.text)
+        # Filters values based on threshold
+        if not threshold or score > threshold:
+            return doc.index + (int(score), standard)
+        else:
+            return doc.index + (None, standard)
+
+
+commands['readability'] = Readability
+
+
 # User-Created Classes #
 
 # this class is a modification of class ConditionalCounter()
@@ -413,15 +891,116 @@ class DistributionalPhraseCounter():
             |(?:incommensurate|uneven|inequal|unequal|disparate|systemic|disproportionate)\s+(?:net|social|societal|safety|health)?[-\s]?(?:effect[s]?|impact[s]?|benefit[s]?|cost[s]?|burden[s]?|[\w]*advantag[\w]+|harm[s]?|consequence[s]?|risk[s]?)
             |disproportionately\s+(?:[\w]*advantag[\w]+|affect[\w]*|harm[\w]*|burden[\w]*|risk[\w]*))\b
     ''', re.IGNORECASE | re.VERBOSE)
+    prefilter = None
+    prefilter_lock = threading.Lock()
+    scratch = threading.local()
+    # Every branch of the pattern contains one of these lowercase stems and
+    # spans at most six words, so matches are only sought within six words
+    # either side of a stem
+    stems = re.compile(
+        r'distribut|equit|equal|dignity|minorit|marginaliz|vulnerabl'
+        r'|disadvantag|underserved|underrepresented|dispar|disproportionat'
+        r'|incommensurat|uneven|systemic|systematic|justice|apportion'
+        r'|allocat|divid|income'
+    )
+    words = re.compile(r'\w*(?:\W+\w+){0,6}')
 
     @staticmethod
     def get_columns(args):
         return ('distributional_phrases',)
 
+    @staticmethod
+    def get_prefilter():
+        """
+        Return a Hyperscan database that matches at least every ASCII text the
+        pattern matches, compiling it on first use; None without hyperscan
+        """
+        cls = DistributionalPhraseCounter
+        if hyperscan is not None and cls.prefilter is None:
+            with cls.prefilter_lock:
+                if cls.prefilter is None:
+                    database = hyperscan.Database()
+                    database.compile(
+                        expressions=[b'(?x)' + cls.pattern.pattern.encode()],
+                        flags=[
+                            hyperscan.HS_FLAG_CASELESS
+                            | hyperscan.HS_FLAG_PREFILTER
+                            | hyperscan.HS_FLAG_SINGLEMATCH
+                        ]
+                    )
+                    cls.prefilter = database
+        return cls.prefilter
+
+    @staticmethod
+    def could_match(text):
+        """
+        Return False only if the pattern certainly does not match text
+        """
+        database = DistributionalPhraseCounter.get_prefilter()
+        if database is None:
+            return True
+        try:
+            data = text.encode('ascii').translate(_HYPERSCAN_WHITESPACE)
+        except UnicodeEncodeError:
+            return True
+        local = DistributionalPhraseCounter.scratch
+        if getattr(local, 'scratch', None) is None:
+            local.scratch = hyperscan.Scratch(database)
+        hits = []
+        database.scan(
+            data,
+            match_event_handler=lambda *args: hits.append(True),
+            scratch=local.scratch
+        )
+        return bool(hits)
+
+    @staticmethod
+    def candidate_spans(text):
+        """
+        Yield non-overlapping (start, end) spans of text outside of which the
+        pattern does not match
+
+        Spans start and end at word boundaries, so the pattern's own word
+        boundaries behave as they would in the whole text. If lowercasing could
+        hide a stem from the case-sensitive search, the whole text is yielded
+        instead.
+        """
+        cls = DistributionalPhraseCounter
+        lowered = text.lower()
+        # re.IGNORECASE also equates i with dotless i and s with long s, and
+        # some characters change length when lowercased
+        if (len(lowered) != len(text)
+                or '\u0131' in lowered or '\u017f' in lowered):
+            yield 0, len(text)
+            return
+        reversed_text = text[::-1]
+        span = None
+        for stem in cls.stems.finditer(lowered):
+            start = len(text) - cls.words.match(
+                reversed_text, len(text) - stem.start()).end()
+            end = cls.words.match(text, stem.start()).end()
+            if span is not None and start <= span[1]:
+                span = (span[0], max(span[1], end))
+            else:
+                if span is not None:
+                    yield span
+                span = (start, end)
+        if span is not None:
+            yield span
+
     @staticmethod
     def process_document(doc):
-        return doc.index + (len(DistributionalPhraseCounter.pattern.findall(
-                                ' '.join((doc.text).splitlines()))),)
+        text = ' '.join((doc.text).splitlines())
+        # Gate on the joined text the pattern runs over; in the raw text a
+        # line break such as \r\n can fill two single-character slots
+        if not DistributionalPhraseCounter.could_match(text):
+            return doc.index + (0,)
+        return doc.index + (sum(
+            1 for start, end in
+            DistributionalPhraseCounter.candidate_spans(text)
+            for _ in DistributionalPhraseCounter.pattern.finditer(
+                text, start, end)
+        ),)
 
 
 commands['count_distributional_phrases'] = DistributionalPhraseCounter
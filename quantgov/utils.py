@@ -37,9 +37,14 @@ def lazy_parallel(func, *iterables, **kwargs):
     Keyword Arugments:
     * max_workers: max number of threads or processes. Defaults to None.
     * worker: 'thread' (default) or 'process'
+    * initializer: function called with no arguments in each worker before
+      it runs func. Defaults to None. Requires Python 3.7 or later.
     """
     worker = kwargs.get('worker', 'thread')
     max_workers = kwargs.get('max_workers')
+    pool_kwargs = {}
+    if kwargs.get('initializer') is not None:
+        pool_kwargs['initializer'] = kwargs['initializer']
     if max_workers is None:  # Not in back-port
         max_workers = (os.cpu_count() or 1)
         if worker == 'thread':
@@ -51,7 +56,7 @@ def lazy_parallel(func, *iterables, **kwargs):
                          .format(', '.join(_POOLS.keys())))
     jobs = []
     argsets = zip(*iterables)
-    with pooltype(max_workers) as pool:
+    with pooltype(max_workers, **pool_kwargs) as pool:
         for argset in argsets:
             jobs.append(pool.submit(func, *argset))
             if len(jobs) == pool._max_workers:
@@ -54,6 +54,7 @@ setup(
     install_requires=[
         'decorator',
         'joblib',
+        'numpy',
         'pandas',
         'requests',
         'scikit-learn',
@@ -69,6 +70,10 @@ setup(
         's3driver': [
             'sqlalchemy',
             'boto3'
+        ],
+        'speedups': [
+            'pyahocorasick',
+            'hyperscan'
         ]
     },
     entry_points={
@@ -1,5 +1,6 @@
 import pytest
 import quantgov.corpus
+import quantgov.nlp
 import subprocess
 
 from pathlib import Path
@@ -120,6 +121,14 @@ def test_wordcount_pattern():
     assert output == 'file,words\ncfr,333237\nmoby,210130\n'
 
 
+def test_wordcount_threads():
+    output = check_output(
+        ['quantgov', 'nlp', 'count_words', str(PSEUDO_CORPUS_PATH),
+         '--worker', 'thread', '--max_workers', '2'],
+    )
+    assert output == 'file,words\ncfr,349153\nmoby,216645\n'
+
+
 def test_termcount():
     output = check_output(
         ['quantgov', 'nlp', 'count_occurrences', str(PSEUDO_CORPUS_PATH),
@@ -146,6 +155,36 @@ def test_termcount_multiple_with_label():
                       'cfr,1946,744,122,2812\nmoby,94,285,5,384\n')
 
 
+def test_termcount_group_in_term():
+    output = check_output(
+        ['quantgov', 'nlp', 'count_occurrences', str(PSEUDO_CORPUS_PATH),
+         'shall', '(s)hall', '--total_label', 'all'],
+    )
+    assert output == ('file,shall,(s)hall,all\n'
+                      'cfr,1946,0,1946\nmoby,94,0,94\n')
+
+
+def test_multicount():
+    output = check_output(
+        ['quantgov', 'nlp', 'count_multiple', str(PSEUDO_CORPUS_PATH),
+         '--column', 'shall', 'shall',
+         '--column', 'allofthem', 'shall', 'must', 'may not'],
+    )
+    assert output == ('file,shall,allofthem\n'
+                      'cfr,1946,2812\nmoby,94,384\n')
+
+
+def test_multicount_substring():
+    output = check_output(
+        ['quantgov', 'nlp', 'count_multiple', str(PSEUDO_CORPUS_PATH),
+         '--column', 'shall', 'Shall',
+         '--substring_column', 'shal', 'shal',
+         '--column', 'must', 'must'],
+    )
+    assert output == ('file,shall,shal,must\n'
+                      'cfr,1946,1946,744\nmoby,94,110,285\n')
+
+
 def test_shannon_entropy():
     output = check_output(
         ['quantgov', 'nlp', 'shannon_entropy', str(PSEUDO_CORPUS_PATH)],
@@ -158,7 +197,15 @@ def test_shannon_entropy_no_stopwords():
         ['quantgov', 'nlp', 'shannon_entropy', str(PSEUDO_CORPUS_PATH),
          '--stopwords', 'None'],
     )
-    assert output == 'file,shannon_entropy\ncfr,9.52\nmoby,10.03\n'
+    assert output == 'file,shannon_entropy\ncfr,9.52\nmoby,10.02\n'
+
+
+def test_shannon_entropy_custom_stopwords():
+    output = check_output(
+        ['quantgov', 'nlp', 'shannon_entropy', str(PSEUDO_CORPUS_PATH),
+         '--stopwords', 'the,a'],
+    )
+    assert output == 'file,shannon_entropy\ncfr,9.84\nmoby,10.45\n'
 
 
 def test_shannon_entropy_4decimals():
@@ -176,6 +223,36 @@ def test_conditionalcount():
     assert output == 'file,conditionals\ncfr,2132\nmoby,2374\n'
 
 
+def test_distributional_phrases():
+    output = check_output(
+        ['quantgov', 'nlp', 'count_distributional_phrases',
+         str(PSEUDO_CORPUS_PATH)],
+    )
+    assert output == 'file,distributional_phrases\ncfr,8\nmoby,24\n'
+
+
+@pytest.mark.parametrize('text', [
+    'filler ' * 50 + 'costs are\ndistributed\namong groups' + ' filler' * 50,
+    'The \u017fy\u017ftemic inju\u017ftice',
+    'low\nincome families',
+    'low\r\nincome families',
+    'lower\r\nincome people\r\n',
+    'd\u0131stributional effects',
+    '\u0130ncome allocated among racial\ndisparities',
+    'nothing to count here',
+])
+def test_distributional_candidate_spans(text):
+    counter = quantgov.nlp.DistributionalPhraseCounter
+    joined = ' '.join(text.splitlines())
+    spans = list(counter.candidate_spans(joined))
+    matches = list(counter.pattern.finditer(joined))
+    for match in matches:
+        assert any(start <= match.start() and match.end() <= end
+                   for start, end in spans)
+    document = quantgov.corpus.Document(('x',), text)
+    assert counter.process_document(document) == ('x', len(matches))
+
+
 def test_sentencelength():
     output = check_output(
         ['quantgov', 'nlp', 'sentence_length', str(PSEUDO_CORPUS_PATH)],
@@ -198,3 +275,21 @@ def test_sentiment_analysis_4decimals():
     )
     assert output == ('file,sentiment_polarity,sentiment_subjectivity'
                       '\ncfr,0.0114,0.421\nmoby,0.0816,0.4777\n')
+
+
+def test_readability():
+    output = check_output(
+        ['quantgov', 'nlp', 'readability', str(PSEUDO_CORPUS_PATH)],
+    )
+    assert output == ('file,flesch_reading_ease,text_standard'
+                      '\ncfr,36,11th and 12th grade'
+                      '\nmoby,64,8th and 9th grade\n')
+
+
+def test_sentiment_analysis_0decimals():
+    output = check_output(
+        ['quantgov', 'nlp', 'sentiment_analysis', str(PSEUDO_CORPUS_PATH),
+         '--precision', '0'],
+    )
+    assert output == ('file,sentiment_polarity,sentiment_subjectivity'
+                      '\ncfr,0.0,0.0\nmoby,0.0,0.0\n')